@@ -0,0 +1,17 @@
+"""Optional mypyc build of the server module.
+
+Metadata lives in ``pyproject.toml``. Set ``MCP_SANDTIMER_USE_MYPYC=1`` to
+compile ``server.py`` into a C extension; otherwise a pure Python package is
+built. The package works the same either way.
+"""
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("MCP_SANDTIMER_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["src/mcp_sandtimer/server.py"])
+
+setup(ext_modules=ext_modules)
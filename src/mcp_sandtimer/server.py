@@ -2,17 +2,115 @@
 from __future__ import annotations
 
 import json
+import math
+import os
 import socket
 import sys
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from . import __version__
 
+try:  # Prefer orjson when available; it emits UTF-8 bytes directly.
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; the stdlib handles them.
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        try:
+            value = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the stdlib decide: it accepts a few inputs orjson rejects.
+            return json.loads(data)
+        # orjson turns integers wider than 64 bits into floats. A JSON-RPC id
+        # must be echoed back exactly, so re-parse when one comes back a float.
+        if type(value) is dict and type(value.get("id")) is float:
+            return json.loads(data)
+        return value
+    return json.loads(data)
+
+
 JsonDict = Dict[str, Any]
 
+_HAS_WRITEV = hasattr(os, "writev")
+_NUMBER = (int, float)
+# Shared stand-in for a missing "params" member; handlers only read from it.
+_NO_PARAMS: JsonDict = {}
+
+# Methods that are still executed when sent as notifications (without an id).
+_RUN_AS_NOTIFICATION = frozenset({"initialize"})
+
+
+def _make_result(message_id: Any, result: JsonDict) -> JsonDict:
+    return {"jsonrpc": "2.0", "id": message_id, "result": result}
+
+
+def _make_error(message_id: Any, code: int, message: str) -> JsonDict:
+    return {"jsonrpc": "2.0", "id": message_id, "error": {"code": code, "message": message}}
+
+
+def _write_all(fd: int, parts: List[bytes]) -> None:
+    """Write ``parts`` to ``fd`` with as few syscalls as possible."""
+    if _HAS_WRITEV:
+        written = os.writev(fd, parts)
+        if written == sum(map(len, parts)):
+            return
+        view = memoryview(b"".join(parts))[written:]
+    else:
+        view = memoryview(b"".join(parts))
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _stdout_fileno() -> Optional[int]:
+    """Return the file descriptor behind ``sys.stdout``, if it has one."""
+    try:
+        return sys.stdout.buffer.fileno()
+    except (AttributeError, OSError, ValueError):
+        # stdout has been replaced by something without a file descriptor.
+        return None
+
+
+def _write_stream(data: bytes) -> None:
+    """Write ``data`` through ``sys.stdout``, which may be a text-only stream."""
+    stream = sys.stdout
+    buffer = getattr(stream, "buffer", None)
+    if buffer is not None:
+        buffer.write(data)
+        buffer.flush()
+    else:
+        stream.write(data.decode("utf-8"))
+        stream.flush()
+
+
+def _text_result(text: str) -> JsonDict:
+    """Build a ``tools/call`` result carrying a single text item."""
+    return {"content": [{"type": "text", "text": text}]}
+
+
+class _NullLock:
+    """No-op stand-in for ``threading.Lock`` used when writes are single threaded."""
+
+    def __enter__(self) -> "_NullLock":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
 
 class MCPError(Exception):
     """Base error for MCP responses."""
@@ -22,7 +120,8 @@ class ToolExecutionError(MCPError):
     """Raised when a tool cannot be executed."""
 
 
-@dataclass
+# slots=True needs Python 3.10; a hand-written __slots__ breaks the mypyc build.
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class Tool:
     """Represents a registered tool."""
 
@@ -33,16 +132,45 @@ class Tool:
 
 
 class SandtimerClient:
-    """Thin TCP client responsible for talking to the sandtimer service."""
+    """Thin TCP client responsible for talking to the sandtimer service.
+
+    Each command is sent as one JSON document on its own connection, which the
+    service reads until EOF.
+
+    When ``unix_path`` (or the ``SANDTIMER_SOCK`` environment variable) names a
+    UNIX domain socket and the platform supports it, that socket is used
+    instead of TCP.
+    """
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 61420, timeout: float = 5.0) -> None:
+    __slots__ = ("host", "port", "timeout", "unix_path")
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 61420,
+        timeout: float = 5.0,
+        unix_path: Optional[str] = None,
+    ) -> None:
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.unix_path = unix_path or os.environ.get("SANDTIMER_SOCK") or None
+
+    def _connect(self) -> socket.socket:
+        if self.unix_path and hasattr(socket, "AF_UNIX"):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.unix_path)
+            except OSError:
+                sock.close()
+                raise
+            return sock
+        return socket.create_connection((self.host, self.port), timeout=self.timeout)
 
     def _send(self, payload: JsonDict) -> None:
-        message = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-        with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+        message = _dumps(payload)
+        with self._connect() as conn:
             conn.sendall(message)
 
     def start(self, label: str, seconds: int) -> None:
@@ -58,15 +186,43 @@ class SandtimerClient:
 class MCPServer:
     """A very small MCP compatible JSON-RPC server."""
 
+    __slots__ = (
+        "_client",
+        "_tools",
+        "_tools_list_cache",
+        "_initialized",
+        "_write_lock",
+        "_rpc",
+        "_pending_ready_notification",
+        "_stdout_fd",
+    )
+
     protocol_version = "2024-05-14"
 
-    def __init__(self, client: Optional[SandtimerClient] = None) -> None:
+    def __init__(self, client: Optional[SandtimerClient] = None, thread_safe: bool = False) -> None:
         self._client = client or SandtimerClient()
         self._tools: Dict[str, Tool] = {}
+        self._tools_list_cache: Optional[JsonDict] = None
         self._initialized = False
-        self._write_lock = threading.Lock()
+        # serve_forever writes from a single thread; only pay for a real lock
+        # when callers say they will write from other threads too.
+        self._write_lock: Union[threading.Lock, _NullLock] = (
+            threading.Lock() if thread_safe else _NullLock()
+        )
+        # Handlers returning None (notifications) never get a response.
+        self._rpc: Dict[str, Callable[[Any], Optional[JsonDict]]] = {
+            "initialize": self._handle_initialize,
+            "tools/list": self._handle_tools_list,
+            "tools/call": self._handle_tools_call,
+            "ping": self._handle_ping,
+            "shutdown": self._handle_shutdown,
+            "notifications/initialized": self._handle_notification,
+            "notifications/cancelled": self._handle_notification,
+        }
         self._register_builtin_tools()
         self._pending_ready_notification: Optional[JsonDict] = None
+        # Resolved in serve_forever so a later stdout redirect is honoured.
+        self._stdout_fd: Optional[int] = None
 
     def _register_builtin_tools(self) -> None:
         self.register_tool(
@@ -130,16 +286,18 @@ class MCPServer:
 
     def register_tool(self, tool: Tool) -> None:
         self._tools[tool.name] = tool
+        self._tools_list_cache = None
 
     # Tool handlers -----------------------------------------------------------------
     def _handle_start_timer(self, arguments: JsonDict) -> str:
         label = self._validate_label(arguments.get("label"))
         seconds_value = arguments.get("time")
-        if not isinstance(seconds_value, (int, float)):
+        # Mirrors the schema ("number", minimum 1); JSON booleans are not numbers.
+        if isinstance(seconds_value, bool) or not isinstance(seconds_value, _NUMBER):
             raise ToolExecutionError("'time' must be a number of seconds.")
+        if not 1 <= seconds_value < math.inf:
+            raise ToolExecutionError("'time' must be at least 1 second.")
         seconds = int(seconds_value)
-        if seconds <= 0:
-            raise ToolExecutionError("'time' must be greater than zero.")
         try:
             self._client.start(label, seconds)
         except OSError as exc:  # pragma: no cover - network interaction
@@ -164,94 +322,102 @@ class MCPServer:
 
     @staticmethod
     def _validate_label(label: Any) -> str:
-        if not isinstance(label, str) or not label.strip():
+        if not isinstance(label, str):
             raise ToolExecutionError("'label' must be a non-empty string.")
-        return label.strip()
+        stripped = label.strip()
+        if not stripped:
+            raise ToolExecutionError("'label' must be a non-empty string.")
+        return stripped
 
     # JSON-RPC plumbing --------------------------------------------------------------
     def serve_forever(self) -> None:
         """Start serving requests over STDIO."""
+        self._stdout_fd = _stdout_fileno()
+        if self._stdout_fd is not None:
+            # Responses bypass sys.stdout, so emit anything already buffered.
+            sys.stdout.flush()
+        try:
+            fd = sys.stdin.buffer.fileno()
+        except (AttributeError, OSError, ValueError):
+            # stdin has been replaced by a stream without a file descriptor.
+            self._serve_lines()
+            return
+        buf = bytearray()
+        read = os.read
+        process_line = self._process_line
+        while True:
+            chunk = read(fd, 65536)
+            if not chunk:
+                break
+            buf.extend(chunk)
+            while (nl := buf.find(b"\n")) != -1:
+                line = bytes(buf[:nl])
+                del buf[: nl + 1]
+                process_line(line)
+        # Handle a final message that was not newline terminated.
+        if buf:
+            self._process_line(bytes(buf))
+
+    def _serve_lines(self) -> None:
         stdin = sys.stdin
         while True:
             line = stdin.readline()
             if not line:
                 break
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                message = json.loads(line)
-            except json.JSONDecodeError:
-                self._send_error(None, code=-32700, message="Parse error")
-                continue
-            response = self._handle_message(message)
-            if response is not None:
-                self._write_json(response)
-
-    def _handle_message(self, message: JsonDict) -> Optional[JsonDict]:
-        if not isinstance(message, dict):
-            return self._make_error(None, -32600, "Invalid request")
-
-        message_id = message.get("id")
-        method = message.get("method")
+            self._process_line(line)
+
+    def _process_line(self, line: Union[bytes, str]) -> None:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            message = _loads(line)
+        except ValueError:
+            self._send_error(None, code=-32700, message="Parse error")
+            return
+        response = self._handle_message(message)
+        if response is not None:
+            self._write_json(response)
+
+    def _handle_message(self, message: Any) -> Optional[JsonDict]:
+        try:
+            method = message.get("method")
+        except AttributeError:
+            return _make_error(None, -32600, "Invalid request")
         if method:
-            params = message.get("params", {})
-            if not isinstance(params, dict):
-                params = {}
-            if method == "initialize":
-                result = self._handle_initialize(params)
-                if message_id is not None:
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "result": result,
-                    }
-                return None
-            if method == "tools/list":
-                result = self._handle_tools_list()
-                if message_id is not None:
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "result": result,
-                    }
-                return None
-            if method == "tools/call":
-                if message_id is None:
+            message_id = message.get("id")
+            handler = self._rpc.get(method)
+            if handler is None:
+                # Known notifications are in the table; prefix matching is only
+                # needed for the rare unknown one.
+                if message_id is None or method.startswith("notifications/"):
                     return None
-                try:
-                    result = self._handle_tools_call(params)
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "result": {
-                            "content": [
-                                {"type": "text", "text": result}
-                            ]
-                        },
-                    }
-                except ToolExecutionError as exc:
-                    return self._make_error(message_id, -32002, str(exc))
-                except Exception as exc:  # pragma: no cover - safeguard
-                    return self._make_error(message_id, -32099, f"Unexpected error: {exc}")
-            if method in {"ping", "shutdown"}:
-                if message_id is not None:
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": message_id,
-                        "result": {"time": time.time()} if method == "ping" else {},
-                    }
+                return _make_error(message_id, -32601, f"Method '{method}' not found")
+            # Requests without an id are notifications: only methods with side
+            # effects are executed, and no response is sent.
+            if message_id is None and method not in _RUN_AS_NOTIFICATION:
                 return None
-            if method.startswith("notifications/"):
+            params = message.get("params", _NO_PARAMS)
+            try:
+                result = handler(params)
+            except ToolExecutionError as exc:
+                return _make_error(message_id, -32002, str(exc))
+            except Exception as exc:  # pragma: no cover - safeguard
+                return _make_error(message_id, -32099, f"Unexpected error: {exc}")
+            if message_id is None or result is None:
                 return None
-            if message_id is not None:
-                return self._make_error(message_id, -32601, f"Method '{method}' not found")
-            return None
+            return _make_result(message_id, result)
         # If it is a response, ignore.
         return None
 
-    def _handle_initialize(self, params: JsonDict) -> JsonDict:
-        protocol_version = params.get("protocolVersion") or self.protocol_version
+    # RPC methods --------------------------------------------------------------------
+    # Registered directly in the dispatch table; each takes the request params
+    # and returns the result object (None for notifications).
+    def _handle_initialize(self, params: Any) -> JsonDict:
+        try:
+            protocol_version = params.get("protocolVersion") or self.protocol_version
+        except AttributeError:
+            protocol_version = self.protocol_version
         self._initialized = True
         self._pending_ready_notification = {
             "jsonrpc": "2.0",
@@ -269,24 +435,29 @@ class MCPServer:
             },
         }
 
-    def _handle_tools_list(self) -> JsonDict:
-        tools = [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "inputSchema": tool.schema,
-            }
-            for tool in self._tools.values()
-        ]
-        return {"tools": tools}
-
-    def _handle_tools_call(self, params: JsonDict) -> str:
+    def _handle_tools_list(self, params: Any) -> JsonDict:
+        if self._tools_list_cache is None:
+            tools = [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "inputSchema": tool.schema,
+                }
+                for tool in self._tools.values()
+            ]
+            self._tools_list_cache = {"tools": tools}
+        return self._tools_list_cache
+
+    def _handle_tools_call(self, params: Any) -> JsonDict:
         if not self._initialized:
             raise ToolExecutionError("Server has not been initialized yet.")
-        name = params.get("name")
+        try:
+            name = params.get("name")
+            arguments = params.get("arguments")
+        except AttributeError:
+            raise ToolExecutionError("'params' must be an object.") from None
         if not isinstance(name, str):
             raise ToolExecutionError("Invalid tool name.")
-        arguments = params.get("arguments")
         if arguments is None:
             arguments = {}
         if not isinstance(arguments, dict):
@@ -294,28 +465,36 @@ class MCPServer:
         tool = self._tools.get(name)
         if tool is None:
             raise ToolExecutionError(f"Tool '{name}' is not available.")
-        return tool.handler(arguments)
+        return _text_result(tool.handler(arguments))
 
-    def _make_error(self, message_id: Any, code: int, message: str) -> JsonDict:
-        return {"jsonrpc": "2.0", "id": message_id, "error": {"code": code, "message": message}}
+    def _handle_ping(self, params: Any) -> JsonDict:
+        return {"time": time.time()}
+
+    def _handle_shutdown(self, params: Any) -> JsonDict:
+        return {}
+
+    def _handle_notification(self, params: Any) -> None:
+        return None
+
+    @staticmethod
+    def _make_error(message_id: Any, code: int, message: str) -> JsonDict:
+        return _make_error(message_id, code, message)
 
     def _send_error(self, message_id: Any, code: int, message: str) -> None:
-        self._write_json(self._make_error(message_id, code, message))
+        self._write_json(_make_error(message_id, code, message))
 
     def _write_json(self, payload: JsonDict) -> None:
-        text = json.dumps(payload, ensure_ascii=False)
+        """Write a message, followed by any pending server notification."""
+        parts = [_dumps(payload), b"\n"]
         with self._write_lock:
-            sys.stdout.write(text + "\n")
-            sys.stdout.flush()
-        self._flush_pending_notifications()
-
-    def _flush_pending_notifications(self) -> None:
-        if self._pending_ready_notification is not None:
             notification = self._pending_ready_notification
-            self._pending_ready_notification = None
-            with self._write_lock:
-                sys.stdout.write(json.dumps(notification, ensure_ascii=False) + "\n")
-                sys.stdout.flush()
+            if notification is not None:
+                self._pending_ready_notification = None
+                parts += [_dumps(notification), b"\n"]
+            if self._stdout_fd is not None:
+                _write_all(self._stdout_fd, parts)
+            else:
+                _write_stream(b"".join(parts))
 
 
 def serve() -> None: